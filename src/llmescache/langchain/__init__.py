@@ -1,7 +1,12 @@
-from llmescache.langchain.cache import ElasticsearchCache
-from llmescache.langchain.storage import ElasticsearchStore
+from llmescache.langchain.base import make_es_client, shared_client
+from llmescache.langchain.cache import AsyncElasticsearchCache, ElasticsearchCache
+from llmescache.langchain.storage import AsyncElasticsearchStore, ElasticsearchStore
 
 __all__ = [
+    "AsyncElasticsearchCache",
+    "AsyncElasticsearchStore",
     "ElasticsearchCache",
     "ElasticsearchStore",
+    "make_es_client",
+    "shared_client",
 ]
@@ -1,8 +1,118 @@
+import threading
+import time
+import weakref
 from abc import abstractmethod
-from typing import Dict, Any
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
 
 import elasticsearch
-from elasticsearch import Elasticsearch
+from elasticsearch import AsyncElasticsearch, Elasticsearch
+
+# indices already validated in this process, per client: maps each index/alias
+# name to whether it is an alias, so building another cache or store on the
+# same client and index skips the validation round-trips
+_validated_indices: "weakref.WeakKeyDictionary[Any, Dict[str, bool]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+_ts_cache: Tuple[int, str] = (0, "")
+
+
+def _now_iso() -> str:
+    """Current ISO timestamp, cached at one-second granularity.
+
+    Document timestamps do not need sub-second precision, so bulk write
+    loops can share one datetime allocation and formatting per second.
+    """
+    global _ts_cache
+    now = int(time.time())
+    if _ts_cache[0] != now:
+        _ts_cache = (now, datetime.fromtimestamp(now).isoformat())
+    return _ts_cache[1]
+
+
+def make_es_client(*args: Any, **kwargs: Any) -> Elasticsearch:
+    """Build an `Elasticsearch` client tuned for cache workloads.
+
+    Enables transport compression and, when the `orjson` extra is installed,
+    the orjson serializer, which encodes and decodes float-heavy bodies
+    several times faster than the stdlib json. Any explicit kwarg wins.
+    """
+    kwargs.setdefault("http_compress", True)
+    if "serializer" not in kwargs:
+        try:
+            from elasticsearch import OrjsonSerializer
+        except ImportError:
+            pass
+        else:
+            kwargs["serializer"] = OrjsonSerializer()
+    return Elasticsearch(*args, **kwargs)
+
+
+_shared_clients: Dict[Any, Elasticsearch] = {}
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn lists and dicts into tuples, for use in a dict key."""
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in sorted(value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def shared_client(*args: Any, **kwargs: Any) -> Elasticsearch:
+    """Return a process-wide `Elasticsearch` client for the given arguments.
+
+    A cache and a store pointed at the same cluster should share one
+    client: separate clients mean separate connection pools, and every
+    pool pays its own TCP and TLS handshakes. Repeated calls with the
+    same arguments hand back the same client, built by `make_es_client`
+    with a larger pool (32 connections per node) and `retry_on_timeout`
+    enabled.
+    """
+    # hosts lists and transport option dicts must not break the memo key
+    key = (_freeze(args), _freeze(kwargs))
+    client = _shared_clients.get(key)
+    if client is None:
+        kwargs.setdefault("connections_per_node", 32)
+        kwargs.setdefault("retry_on_timeout", True)
+        client = _shared_clients[key] = make_es_client(*args, **kwargs)
+    return client
+
+
+class LRUCache:
+    """Minimal thread-safe LRU map, used as an in-process front cache
+    to serve repeated keys without an Elasticsearch round-trip."""
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
 
 
 class ElasticsearchIndexer:
@@ -10,25 +120,109 @@ class ElasticsearchIndexer:
 
     _es_client: Elasticsearch
     _es_index: str
+    _index_validated: bool = False
+    _verify_on_init: bool = False
 
     def _manage_index(self):
-        """Write or update an index according to the default mapping"""
-        if not self._es_client.ping():
+        """Write or update an index according to the default mapping.
+
+        A single indices.get round-trip reveals whether the name is an
+        alias, whether the index exists, and whether the mapping is already
+        in place, replacing the ping/exists_alias/exists probe sequence.
+        """
+        validated = _validated_indices.get(self._es_client)
+        if validated is not None and self._es_index in validated:
+            self._is_alias = validated[self._es_index]
+            self._index_validated = True
+            return
+        if self._verify_on_init and not self._es_client.ping():
             raise elasticsearch.exceptions.ConnectionError(
                 "Elasticsearch cluster is not available, not able to set up the cache store."
             )
-        self._is_alias = False
-        if self._es_client.indices.exists_alias(name=self._es_index):
-            self._is_alias = True
-        elif not self._es_client.indices.exists(index=self._es_index):
+        response = self._es_client.indices.get(
+            index=self._es_index, ignore_unavailable=True
+        )
+        if not response:
+            self._is_alias = False
             self._es_client.indices.create(index=self._es_index, body=self.mapping)
-            return
-        self._es_client.indices.put_mapping(
-            index=self._es_index, body=self.mapping["mappings"]
+        else:
+            # an alias resolves to concrete indices under different names
+            self._is_alias = self._es_index not in response
+            if any(
+                info.get("mappings") != self.mapping["mappings"]
+                for info in response.values()
+            ):
+                self._es_client.indices.put_mapping(
+                    index=self._es_index, body=self.mapping["mappings"]
+                )
+        _validated_indices.setdefault(self._es_client, {})[self._es_index] = (
+            self._is_alias
         )
+        self._index_validated = True
+
+    def _warn_if_uncompressed(self):
+        """Log a hint when the client was built without `http_compress`.
+
+        Vector and bulk payloads gzip several times over, so an
+        uncompressed transport wastes most of the egress bandwidth;
+        `make_es_client` enables compression by default.
+        """
+        try:
+            compressed = self._es_client.transport.node_pool.get().config.http_compress
+        except Exception:
+            # transports without an inspectable pool (or test doubles)
+            return
+        if compressed is False:
+            self._logger.warning(
+                "The Elasticsearch client was created without http_compress=True; "
+                "consider make_es_client() to cut the bytes on the wire."
+            )
+
+    def _ensure_index(self):
+        """Run the deferred index validation for instances built with `lazy_init`."""
+        if not self._index_validated:
+            self._manage_index()
 
     @property
     @abstractmethod
     def mapping(self) -> Dict[str, Any]:
         """Get the default mapping for the index."""
         return {}
+
+
+class AsyncElasticsearchIndexer(ElasticsearchIndexer):
+    """Mixin for asynchronous Elasticsearch clients"""
+
+    _es_client: AsyncElasticsearch  # type: ignore[assignment]
+
+    def _manage_index(self):
+        """Defer index management to the first operation, since it needs awaits."""
+        self._is_alias = False
+        self._index_managed = False
+
+    async def _async_manage_index(self):
+        """Write or update an index according to the default mapping"""
+        if self._index_managed:
+            return
+        if self._verify_on_init and not await self._es_client.ping():
+            raise elasticsearch.exceptions.ConnectionError(
+                "Elasticsearch cluster is not available, not able to set up the cache store."
+            )
+        response = await self._es_client.indices.get(
+            index=self._es_index, ignore_unavailable=True
+        )
+        if not response:
+            self._is_alias = False
+            await self._es_client.indices.create(
+                index=self._es_index, body=self.mapping
+            )
+        else:
+            self._is_alias = self._es_index not in response
+            if any(
+                info.get("mappings") != self.mapping["mappings"]
+                for info in response.values()
+            ):
+                await self._es_client.indices.put_mapping(
+                    index=self._es_index, body=self.mapping["mappings"]
+                )
+        self._index_managed = True
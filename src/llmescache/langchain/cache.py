@@ -1,14 +1,87 @@
+import base64
+import copy
 import hashlib
-from datetime import datetime
-from functools import cached_property
-from operator import itemgetter
-from typing import Any, Optional, Dict
+import json
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Dict, Sequence, Tuple
 import elasticsearch
-from elasticsearch import NotFoundError
+from elasticsearch import ConflictError, NotFoundError, helpers
+from elasticsearch.helpers import BulkIndexError
 from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
-from langchain_core.load import dumps, loads
+from langchain_core.load import load
+from langchain_core.load.dump import default as _lc_serializer_default
 
-from llmescache.langchain.base import ElasticsearchIndexer
+from llmescache.langchain.base import (
+    AsyncElasticsearchIndexer,
+    ElasticsearchIndexer,
+    LRUCache,
+    _now_iso,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+if orjson is not None:
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=_lc_serializer_default).decode()
+
+    _json_loads = orjson.loads
+else:
+
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, default=_lc_serializer_default)
+
+    _json_loads = json.loads
+
+
+# shared across instances: the cache mapping has no per-instance parameters
+_DEFAULT_MAPPING: Dict[str, Any] = {
+    # cached generations are write-once and read rarely: trade some
+    # CPU on fetch for a much smaller disk and page-cache footprint,
+    # and relax the refresh rate since reads tolerate stale entries
+    "settings": {"index": {"codec": "best_compression", "refresh_interval": "30s"}},
+    "mappings": {
+        "properties": {
+            "llm_output": {"type": "text", "index": False},
+            "llm_params": {"type": "text", "index": False},
+            "llm_input": {"type": "text", "index": False},
+            "metadata": {"type": "object"},
+            "timestamp": {"type": "date"},
+        }
+    },
+}
+
+
+@lru_cache(maxsize=64)
+def _llm_string_seed(llm_string: str) -> "hashlib._Hash":
+    """Hasher pre-seeded with the llm_string, which repeats across prompts
+    (it describes the model and its parameters), so its bytes are absorbed
+    into the hash state only once per distinct value."""
+    return hashlib.blake2b(llm_string.encode(), digest_size=16)
+
+
+def _dumps_generations(generations: RETURN_VAL_TYPE) -> str:
+    """Serialize generations to a single JSON blob, preserving LangChain semantics.
+
+    One blob means one encode/parse per document instead of one per generation,
+    and larger blocks compress better in the Lucene stored fields.
+    """
+    return _json_dumps(list(generations))
+
+
+def _loads_generations(blob: Any) -> RETURN_VAL_TYPE:
+    """Deserialize a JSON blob back to generation objects."""
+    if isinstance(blob, list):
+        # documents written before 0.2.7 hold one serialized string per generation
+        return [load(_json_loads(item)) for item in blob]
+    return [load(item) for item in _json_loads(blob)]
 
 
 class ElasticsearchCache(BaseCache, ElasticsearchIndexer):
@@ -22,6 +95,10 @@ class ElasticsearchCache(BaseCache, ElasticsearchIndexer):
         store_timestamp: bool = True,
         store_input_params: bool = True,
         metadata: Optional[Dict[str, Any]] = None,
+        local_cache_size: Optional[int] = None,
+        lazy_init: bool = False,
+        verify_on_init: bool = False,
+        refresh_on_write: bool = True,
     ):
         """
         Initialize the Elasticsearch cache store by specifying the index/alias
@@ -30,6 +107,14 @@ class ElasticsearchCache(BaseCache, ElasticsearchIndexer):
 
         Args:
             es_client (Elasticsearch): The Elasticsearch client to use for the cache store.
+                Reuse a single client across caches and stores so they share its TCP
+                connection pool; for concurrent workloads construct it with a pool at
+                least as large as the expected concurrency and with compression enabled,
+                e.g. `Elasticsearch(..., http_compress=True, request_timeout=10)`.
+                With the `orjson` extra installed, also pass
+                `serializer=elasticsearch.OrjsonSerializer()` so the transport
+                encodes and decodes request bodies several times faster than
+                with the stdlib json.
             es_index (str): The name of the index or the alias to use for the cache store.
             If they do not exist an index is created, according to the default mapping defined by `mapping` property.
             store_input (bool): Whether to store the LLM input in the cache, i.e., the input prompt. Default to True.
@@ -39,6 +124,19 @@ class ElasticsearchCache(BaseCache, ElasticsearchIndexer):
                 parameters used to generate the LLM response. Default to True.
             metadata (Optional[dict]): Additional metadata to store in the cache, for filtering purposes.
                 This must be JSON serializable in an Elasticsearch document. Default to None.
+            local_cache_size (Optional[int]): If provided, keep up to this many decoded
+                cache entries in an in-process LRU map, so repeated lookups of the same
+                prompt skip the Elasticsearch round-trip entirely. Default to None (disabled).
+            lazy_init (bool): If True, defer the cluster and index validation round-trips
+                to the first cache operation instead of performing them here. Default to False.
+            verify_on_init (bool): If True, ping the cluster before validating the index
+                and raise a ConnectionError if it is unreachable, at the cost of an extra
+                round-trip. Default to False.
+            refresh_on_write (bool): Whether every write forces an index refresh,
+                making it immediately visible to lookups. Set to False for
+                ingestion-heavy workloads — a per-document refresh is the classic
+                Elasticsearch throughput killer — and call `flush()` once at the
+                end. Default to True.
         """
         self._es_client = es_client
         self._es_index = es_index
@@ -46,84 +144,500 @@ class ElasticsearchCache(BaseCache, ElasticsearchIndexer):
         self._store_timestamp = store_timestamp
         self._store_input_params = store_input_params
         self._metadata = metadata
-        self._manage_index()
+        # the static part of every document is computed once here, so
+        # build_document only has to fill in the per-call fields; the
+        # metadata is deep-copied so later caller-side mutations cannot
+        # leak into every document written from the template
+        self._doc_base: Dict[str, Any] = {}
+        if metadata is not None:
+            self._doc_base["metadata"] = copy.deepcopy(metadata)
+        self._local_cache = LRUCache(local_cache_size) if local_cache_size else None
+        self._verify_on_init = verify_on_init
+        self._refresh_on_write = refresh_on_write
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._warn_if_uncompressed()
+        if lazy_init:
+            self._is_alias = False
+        else:
+            self._manage_index()
 
-    @cached_property
+    @property
     def mapping(self) -> Dict[str, Any]:
         """Get the default mapping for the index."""
-        return {
-            "mappings": {
-                "properties": {
-                    "llm_output": {"type": "text", "index": False},
-                    "llm_params": {"type": "text", "index": False},
-                    "llm_input": {"type": "text", "index": False},
-                    "metadata": {"type": "object"},
-                    "timestamp": {"type": "date"},
-                }
-            }
-        }
+        return _DEFAULT_MAPPING
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _key(prompt: str, llm_string: str) -> str:
-        """Generate a key for the cache store."""
-        return hashlib.md5((prompt + llm_string).encode()).hexdigest()
+        """Generate a key for the cache store.
+
+        The derivation is pure, so results are memoized: repeated prompts —
+        the whole point of a cache — skip the digest entirely.
+
+        The 16-byte digest is rendered as 22 chars of unpadded urlsafe
+        base64 rather than 32 of hex: document ids travel on every request
+        and are stored with each Lucene doc, so shorter is cheaper.
+        """
+        hasher = _llm_string_seed(llm_string).copy()
+        hasher.update(prompt.encode())
+        return base64.urlsafe_b64encode(hasher.digest()).rstrip(b"=").decode("ascii")
+
+    @classmethod
+    def _keys(cls, pairs: Sequence[Tuple[str, str]]) -> List[str]:
+        """Derive the cache keys for a batch of (prompt, llm_string) pairs."""
+        key = cls._key
+        return [key(prompt, llm_string) for prompt, llm_string in pairs]
 
     def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
         """Look up based on prompt and llm_string."""
+        self._ensure_index()
         cache_key = self._key(prompt, llm_string)
+        if self._local_cache is not None:
+            local_hit = self._local_cache.get(cache_key)
+            if local_hit is not None:
+                return local_hit
         if self._is_alias:
             result = self._es_client.search(
                 index=self._es_index,
-                body={"query": {"term": {"_id": cache_key}}},
+                body={
+                    "query": {"term": {"_id": cache_key}},
+                    # pick the record from the latest index on the ES side,
+                    # assuming lexicographic order is chronological; each
+                    # shard holds at most one match, so it can stop early
+                    "sort": [{"_index": {"order": "desc"}}],
+                    "size": 1,
+                    "terminate_after": 1,
+                    # the hit list is all that is read: skip total accounting
+                    "track_total_hits": False,
+                },
                 source_includes=["llm_output"],
+                routing=cache_key,
             )
-            if result["hits"]["total"]["value"] > 0:
-                # get the record from the latest index, assuming lexicographic order is chronological
-                record = max(result["hits"]["hits"], key=itemgetter("_index"))
+            if result["hits"]["hits"]:
+                record = result["hits"]["hits"][0]
             else:
                 return None
         else:
             try:
                 record = self._es_client.get(
-                    index=self._es_index, id=cache_key, source=["llm_output"]
+                    index=self._es_index,
+                    id=cache_key,
+                    source=["llm_output"],
+                    routing=cache_key,
+                    # read from the last refreshed searcher, skipping the
+                    # translog check a realtime get performs
+                    realtime=False,
                 )
             except NotFoundError:
                 return None
-        return [loads(item) for item in record["_source"]["llm_output"]]
+        return_val = _loads_generations(record["_source"]["llm_output"])
+        if self._local_cache is not None:
+            self._local_cache.set(cache_key, return_val)
+        return return_val
+
+    def mlookup(
+        self, pairs: Sequence[Tuple[str, str]]
+    ) -> List[Optional[RETURN_VAL_TYPE]]:
+        """Look up many (prompt, llm_string) pairs with a single request."""
+        if not pairs:
+            return []
+        self._ensure_index()
+        cache_keys = self._keys(pairs)
+        results: List[Optional[RETURN_VAL_TYPE]] = [None] * len(cache_keys)
+        if self._local_cache is not None:
+            missing = []
+            for position, cache_key in enumerate(cache_keys):
+                local_hit = self._local_cache.get(cache_key)
+                if local_hit is not None:
+                    results[position] = local_hit
+                else:
+                    missing.append(position)
+        else:
+            missing = list(range(len(cache_keys)))
+        if not missing:
+            return results
+        fetched = self._mfetch([cache_keys[position] for position in missing])
+        for position, return_val in zip(missing, fetched):
+            results[position] = return_val
+            if return_val is not None and self._local_cache is not None:
+                self._local_cache.set(cache_keys[position], return_val)
+        return results
+
+    def lookup_many(
+        self, pairs: Sequence[Tuple[str, str]]
+    ) -> List[Optional[RETURN_VAL_TYPE]]:
+        """Batched lookup for many (prompt, llm_string) pairs.
+
+        Alias for `mlookup`, which already collapses the batch into one
+        request (a terms query on an alias, an mget otherwise) — cheaper
+        than an msearch of independent term queries.
+        """
+        return self.mlookup(pairs)
+
+    def _mfetch(self, cache_keys: Sequence[str]) -> List[Optional[RETURN_VAL_TYPE]]:
+        """Fetch and decode many cache entries by key with a single request."""
+        records: List[Optional[Dict[str, Any]]]
+        if self._is_alias:
+            result = self._es_client.search(
+                index=self._es_index,
+                body={
+                    "query": {"terms": {"_id": cache_keys}},
+                    "size": len(cache_keys),
+                    "track_total_hits": False,
+                },
+                source_includes=["llm_output"],
+                routing=",".join(cache_keys),
+            )
+            hits_by_id: Dict[str, Any] = {}
+            for hit in result["hits"]["hits"]:
+                previous = hits_by_id.get(hit["_id"])
+                # keep the record from the latest index, assuming lexicographic order is chronological
+                if previous is None or hit["_index"] > previous["_index"]:
+                    hits_by_id[hit["_id"]] = hit
+            records = [hits_by_id.get(key) for key in cache_keys]
+        else:
+            response = self._es_client.mget(
+                index=self._es_index,
+                ids=cache_keys,
+                source_includes=["llm_output"],
+                realtime=False,
+            )
+            records = [doc if doc["found"] else None for doc in response["docs"]]
+        return [
+            _loads_generations(record["_source"]["llm_output"]) if record else None
+            for record in records
+        ]
 
     def build_document(
-        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE
+        self,
+        prompt: str,
+        llm_string: str,
+        return_val: RETURN_VAL_TYPE,
+        timestamp: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Build the Elasticsearch document for storing a single LLM interaction"""
-        body: Dict[str, Any] = {
-            "llm_output": [dumps(item) for item in return_val],
-        }
+        """Build the Elasticsearch document for storing a single LLM interaction.
+
+        An explicit `timestamp` lets batched writers stamp a whole batch with
+        a single formatted datetime.
+        """
+        body = dict(self._doc_base)
+        body["llm_output"] = _dumps_generations(return_val)
         if self._store_input_params:
             body["llm_params"] = llm_string
-        if self._metadata is not None:
-            body["metadata"] = self._metadata
         if self._store_input:
             body["llm_input"] = prompt
         if self._store_timestamp:
-            body["timestamp"] = datetime.now().isoformat()
+            body["timestamp"] = timestamp or _now_iso()
         return body
 
     def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
         """Update based on prompt and llm_string."""
+        self._ensure_index()
+        cache_key = self._key(prompt, llm_string)
         body = self.build_document(prompt, llm_string, return_val)
-        self._es_client.index(
-            index=self._es_index,
-            id=self._key(prompt, llm_string),
-            body=body,
-            require_alias=self._is_alias,
-            refresh=True,
+        try:
+            self._es_client.create(
+                index=self._es_index,
+                id=cache_key,
+                body=body,
+                routing=cache_key,
+                require_alias=self._is_alias,
+                refresh=self._refresh_on_write,
+            )
+        except ConflictError:
+            # the entry already exists: skip the redundant Lucene write
+            pass
+        if self._local_cache is not None:
+            self._local_cache.set(cache_key, return_val)
+
+    def _bulk(
+        self, actions: Iterable[Dict[str, Any]], require_alias: Optional[bool] = None
+    ):
+        try:
+            # drain the generator without buffering the per-document results;
+            # worker threads overlap document encoding with the HTTP requests
+            deque(
+                helpers.parallel_bulk(
+                    client=self._es_client,
+                    actions=actions,
+                    thread_count=8,
+                    chunk_size=500,
+                    queue_size=4,
+                    index=self._es_index,
+                    require_alias=(
+                        self._is_alias if require_alias is None else require_alias
+                    ),
+                    refresh=self._refresh_on_write,
+                ),
+                maxlen=0,
+            )
+        except BulkIndexError as e:
+            first_error = e.errors[0].get("index", {}).get("error", {})
+            self._logger.error(f"First bulk error reason: {first_error.get('reason')}")
+            raise e
+
+    def bulk_update(self, items: Iterable[Tuple[str, str, RETURN_VAL_TYPE]]) -> None:
+        """
+        Update the cache for many (prompt, llm_string, return_val) triples
+        with a single bulk request, amortizing the HTTP round-trip cost of
+        per-document `update` calls.
+        """
+        self._ensure_index()
+        key = self._key
+        build_document = self.build_document
+        timestamp = _now_iso() if self._store_timestamp else None
+        actions = (
+            {
+                "_op_type": "index",
+                "_id": (cache_key := key(prompt, llm_string)),
+                "_routing": cache_key,
+                "_source": build_document(
+                    prompt, llm_string, return_val, timestamp=timestamp
+                ),
+            }
+            for prompt, llm_string, return_val in items
         )
+        self._bulk(actions)
 
     def clear(self, **kwargs: Any) -> None:
         """Clear cache."""
-        self._es_client.delete_by_query(
-            index=self._es_index,
-            body={"query": {"match_all": {}}},
-            refresh=True,
-            wait_for_completion=True,
+        self._ensure_index()
+        if self._local_cache is not None:
+            self._local_cache.clear()
+        if self._is_alias:
+            # the backing indices cannot be dropped without breaking the alias
+            # setup, e.g. ILM rotation, so tombstone the documents instead
+            self._es_client.delete_by_query(
+                index=self._es_index,
+                body={"query": {"match_all": {}}},
+                refresh=self._refresh_on_write,
+                wait_for_completion=True,
+            )
+        else:
+            # dropping and recreating the index is O(1) in Lucene, while
+            # delete_by_query tombstones and merges away every document
+            self._es_client.indices.delete(
+                index=self._es_index, ignore_unavailable=True
+            )
+            self._es_client.indices.create(index=self._es_index, body=self.mapping)
+
+    def flush(self) -> None:
+        """Make pending writes visible to lookups with a single refresh, for
+        use with `refresh_on_write=False` once a batched ingestion is done."""
+        self._es_client.indices.refresh(index=self._es_index)
+
+    def evict_older_than(self, ttl: timedelta, page_size: int = 1000) -> int:
+        """Delete the entries written more than `ttl` ago, returning how many.
+
+        Pages through the matches with a point in time and `search_after`
+        and deletes them in bulk, so eviction runs with bounded memory and
+        without the scan-and-merge cost `delete_by_query` incurs on large
+        aliases. Requires documents written with `store_timestamp=True`.
+        """
+        self._ensure_index()
+        cutoff = (datetime.now() - ttl).isoformat()
+        pit_id = self._es_client.open_point_in_time(
+            index=self._es_index, keep_alive="5m"
+        )["id"]
+        evicted = 0
+        search_after: Optional[List[Any]] = None
+        try:
+            while True:
+                body: Dict[str, Any] = {
+                    "query": {"range": {"timestamp": {"lt": cutoff}}},
+                    "pit": {"id": pit_id, "keep_alive": "5m"},
+                    "sort": [{"timestamp": "asc"}],
+                    "size": page_size,
+                    "track_total_hits": False,
+                }
+                if search_after is not None:
+                    body["search_after"] = search_after
+                result = self._es_client.search(body=body, source=False)
+                hits = result["hits"]["hits"]
+                if not hits:
+                    break
+                pit_id = result.get("pit_id", pit_id)
+                # deletes address the hit's concrete index, never the alias
+                self._bulk(
+                    (
+                        {
+                            "_op_type": "delete",
+                            "_id": hit["_id"],
+                            "_index": hit["_index"],
+                        }
+                        for hit in hits
+                    ),
+                    require_alias=False,
+                )
+                evicted += len(hits)
+                search_after = hits[-1]["sort"]
+        finally:
+            self._es_client.close_point_in_time(id=pit_id)
+        if self._local_cache is not None:
+            # cheaper than matching local entries against the cutoff
+            self._local_cache.clear()
+        return evicted
+
+
+class AsyncElasticsearchCache(AsyncElasticsearchIndexer, ElasticsearchCache):
+    """Cache store for LLM using Elasticsearch, for asyncio-based applications.
+
+    It takes an `AsyncElasticsearch` client and exposes the asynchronous cache
+    interface (`alookup`, `aupdate`, `aclear`), so concurrent cache operations
+    can be awaited in parallel instead of blocking on one network round-trip
+    each. The index is verified lazily on the first operation, since managing
+    it requires awaits. The synchronous methods are not available.
+    """
+
+    _es_client: elasticsearch.AsyncElasticsearch  # type: ignore[assignment]
+
+    def __init__(
+        self,
+        es_client: elasticsearch.AsyncElasticsearch,
+        es_index: str,
+        store_input: bool = True,
+        store_timestamp: bool = True,
+        store_input_params: bool = True,
+        metadata: Optional[Dict[str, Any]] = None,
+        local_cache_size: Optional[int] = None,
+        verify_on_init: bool = False,
+        refresh_on_write: bool = True,
+    ):
+        """
+        Initialize the asynchronous Elasticsearch cache store; the parameters
+        have the same meaning as in `ElasticsearchCache`, but the client must
+        be an `AsyncElasticsearch` one.
+        """
+        super().__init__(
+            es_client,  # type: ignore[arg-type]
+            es_index,
+            store_input=store_input,
+            store_timestamp=store_timestamp,
+            store_input_params=store_input_params,
+            metadata=metadata,
+            local_cache_size=local_cache_size,
+            verify_on_init=verify_on_init,
+            refresh_on_write=refresh_on_write,
+        )
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        raise NotImplementedError("Use alookup with the asynchronous cache.")
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        raise NotImplementedError("Use aupdate with the asynchronous cache.")
+
+    def clear(self, **kwargs: Any) -> None:
+        raise NotImplementedError("Use aclear with the asynchronous cache.")
+
+    def flush(self) -> None:
+        raise NotImplementedError("Use aflush with the asynchronous cache.")
+
+    def mlookup(
+        self, pairs: Sequence[Tuple[str, str]]
+    ) -> List[Optional[RETURN_VAL_TYPE]]:
+        raise NotImplementedError("Use alookup with the asynchronous cache.")
+
+    def lookup_many(
+        self, pairs: Sequence[Tuple[str, str]]
+    ) -> List[Optional[RETURN_VAL_TYPE]]:
+        raise NotImplementedError("Use alookup with the asynchronous cache.")
+
+    def bulk_update(self, items: Iterable[Tuple[str, str, RETURN_VAL_TYPE]]) -> None:
+        raise NotImplementedError("Use aupdate with the asynchronous cache.")
+
+    def evict_older_than(self, ttl: timedelta, page_size: int = 1000) -> int:
+        raise NotImplementedError(
+            "TTL eviction is not available on the asynchronous cache."
         )
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Look up based on prompt and llm_string."""
+        await self._async_manage_index()
+        cache_key = self._key(prompt, llm_string)
+        if self._local_cache is not None:
+            local_hit = self._local_cache.get(cache_key)
+            if local_hit is not None:
+                return local_hit
+        if self._is_alias:
+            result = await self._es_client.search(
+                index=self._es_index,
+                body={
+                    "query": {"term": {"_id": cache_key}},
+                    # pick the record from the latest index on the ES side,
+                    # assuming lexicographic order is chronological; each
+                    # shard holds at most one match, so it can stop early
+                    "sort": [{"_index": {"order": "desc"}}],
+                    "size": 1,
+                    "terminate_after": 1,
+                    # the hit list is all that is read: skip total accounting
+                    "track_total_hits": False,
+                },
+                source_includes=["llm_output"],
+                routing=cache_key,
+            )
+            if result["hits"]["hits"]:
+                record = result["hits"]["hits"][0]
+            else:
+                return None
+        else:
+            try:
+                record = await self._es_client.get(
+                    index=self._es_index,
+                    id=cache_key,
+                    source=["llm_output"],
+                    routing=cache_key,
+                    realtime=False,
+                )
+            except NotFoundError:
+                return None
+        return_val = _loads_generations(record["_source"]["llm_output"])
+        if self._local_cache is not None:
+            self._local_cache.set(cache_key, return_val)
+        return return_val
+
+    async def aupdate(
+        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE
+    ) -> None:
+        """Update based on prompt and llm_string."""
+        await self._async_manage_index()
+        cache_key = self._key(prompt, llm_string)
+        body = self.build_document(prompt, llm_string, return_val)
+        try:
+            await self._es_client.create(
+                index=self._es_index,
+                id=cache_key,
+                body=body,
+                routing=cache_key,
+                require_alias=self._is_alias,
+                refresh=self._refresh_on_write,
+            )
+        except ConflictError:
+            # the entry already exists: skip the redundant Lucene write
+            pass
+        if self._local_cache is not None:
+            self._local_cache.set(cache_key, return_val)
+
+    async def aclear(self, **kwargs: Any) -> None:
+        """Clear cache."""
+        await self._async_manage_index()
+        if self._local_cache is not None:
+            self._local_cache.clear()
+        if self._is_alias:
+            await self._es_client.delete_by_query(
+                index=self._es_index,
+                body={"query": {"match_all": {}}},
+                refresh=self._refresh_on_write,
+                wait_for_completion=True,
+            )
+        else:
+            await self._es_client.indices.delete(
+                index=self._es_index, ignore_unavailable=True
+            )
+            await self._es_client.indices.create(
+                index=self._es_index, body=self.mapping
+            )
+
+    async def aflush(self) -> None:
+        """Make pending writes visible to lookups with a single refresh, for
+        use with `refresh_on_write=False` once a batched ingestion is done."""
+        await self._es_client.indices.refresh(index=self._es_index)
@@ -1,15 +1,100 @@
+import base64
+import copy
 import hashlib
 import logging
-from datetime import datetime
-from functools import cached_property
-from typing import List, Optional, Iterator, Sequence, Tuple, Any, Dict, Iterable
+import struct
+from functools import lru_cache
+from typing import (
+    List,
+    Literal,
+    Optional,
+    Iterator,
+    Sequence,
+    Tuple,
+    Any,
+    Dict,
+    Iterable,
+)
 
 import elasticsearch
 from elasticsearch import helpers
 from elasticsearch.helpers import BulkIndexError
 from langchain_core.stores import BaseStore
 
-from llmescache.langchain.base import ElasticsearchIndexer
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, lists stay the common path
+    np = None  # type: ignore[assignment]
+
+from llmescache.langchain.base import (
+    AsyncElasticsearchIndexer,
+    ElasticsearchIndexer,
+    LRUCache,
+    _now_iso,
+)
+
+
+@lru_cache(maxsize=None)
+def _build_mapping(quantization: str) -> Dict[str, Any]:
+    """Default index mapping, built once per quantization mode and shared
+    across instances."""
+    return {
+        "mappings": {
+            "properties": {
+                "llm_input": {"type": "text", "index": False},
+                # unindexed dense_vector: ES stores the values in their
+                # binary form, skipping JSON decimal parsing on its side
+                "vector_dump": {
+                    "type": "dense_vector",
+                    "index": False,
+                    **({"element_type": "byte"} if quantization == "int8" else {}),
+                },
+                "vector_scale": {"type": "float", "index": False},
+                "metadata": {"type": "object"},
+                "timestamp": {"type": "date"},
+            }
+        }
+    }
+
+
+@lru_cache(maxsize=64)
+def _namespace_seed(namespace: str) -> "hashlib._Hash":
+    """Hasher pre-seeded with the namespace prefix, shared by every key
+    in the store, so its bytes are encoded and absorbed only once."""
+    return hashlib.md5(namespace.encode())
+
+
+@lru_cache(maxsize=4096)
+def _derive_key(namespace: str, input_text: str) -> str:
+    """Derive the document id for an input; pure, so results are memoized
+    and repeated texts skip the digest entirely."""
+    hasher = _namespace_seed(namespace).copy()
+    hasher.update(input_text.encode())
+    return hasher.hexdigest()
+
+
+@lru_cache(maxsize=8)
+def _vec_struct(dim: int) -> struct.Struct:
+    """Packer for a vector of the given dimension, built once per dim."""
+    return struct.Struct(f">{dim}f")
+
+
+def _decode_source(source: Dict[str, Any]) -> List[float]:
+    """Decode the vector held in a document source, dequantizing if needed."""
+    vector = _load_vector(source["vector_dump"])
+    scale = source.get("vector_scale")
+    if scale is not None:
+        return [quantized * scale for quantized in vector]
+    return vector
+
+
+def _load_vector(value: Any) -> List[float]:
+    """Decode a stored vector; documents written by intermediate versions
+    hold a base64 fp32 blob instead of a plain list of floats."""
+    if isinstance(value, list):
+        return value
+    raw = base64.b64decode(value)
+    return list(_vec_struct(len(raw) // 4).unpack(raw))
 
 
 class ElasticsearchStore(BaseStore[str, List[float]], ElasticsearchIndexer):
@@ -21,6 +106,12 @@ class ElasticsearchStore(BaseStore[str, List[float]], ElasticsearchIndexer):
         store_timestamp: bool = True,
         namespace: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
+        bulk_threads: int = 4,
+        bulk_chunk_size: int = 500,
+        refresh_on_write: bool = True,
+        local_cache_size: Optional[int] = None,
+        quantization: Literal["none", "int8"] = "none",
+        verify_on_init: bool = False,
     ):
         """
         Initialize the Elasticsearch cache store by specifying the index/alias
@@ -29,6 +120,14 @@ class ElasticsearchStore(BaseStore[str, List[float]], ElasticsearchIndexer):
 
         Args:
             es_client (Elasticsearch): The Elasticsearch client to use for the cache store.
+                Reuse a single client across caches and stores so they share its TCP
+                connection pool; for concurrent workloads construct it with a pool at
+                least as large as the expected concurrency and with compression enabled,
+                e.g. `Elasticsearch(..., http_compress=True, request_timeout=10)`.
+                With the `orjson` extra installed, also pass
+                `serializer=elasticsearch.OrjsonSerializer()` so the transport
+                encodes and decodes request bodies several times faster than
+                with the stdlib json.
             es_index (str): The name of the index or the alias to use for the cache store.
             If they do not exist an index is created, according to the default mapping defined by `mapping` property.
             store_input (bool): Whether to store the LLM input in the cache, i.e., the input prompt. Default to True.
@@ -37,6 +136,25 @@ class ElasticsearchStore(BaseStore[str, List[float]], ElasticsearchIndexer):
             namespace (Optional[str]): If provided, all keys will be prefixed with this namespace, Default to None.
             metadata (Optional[dict]): Additional metadata to store in the cache, for filtering purposes.
                 This must be JSON serializable in an Elasticsearch document. Default to None.
+            bulk_threads (int): Number of threads pushing bulk chunks concurrently
+                in `mset` and `mdelete`. Default to 4.
+            bulk_chunk_size (int): Number of documents per bulk chunk. Default to 500.
+            refresh_on_write (bool): Whether every `mset`/`mdelete` forces an index
+                refresh, making the writes immediately searchable. Set to False for
+                ingestion-heavy workloads and call `flush()` once at the end.
+                Default to True.
+            local_cache_size (Optional[int]): If provided, keep up to this many
+                vectors in an in-process LRU map, so repeated gets of the same
+                keys skip the Elasticsearch round-trip entirely. Default to None
+                (disabled).
+            quantization (str): With "int8", store each vector as bytes plus a
+                per-vector scale instead of fp32, quartering disk and wire size
+                at the cost of a small quantization error — usually acceptable
+                for embeddings. Vectors are dequantized transparently on read.
+                Default to "none".
+            verify_on_init (bool): If True, ping the cluster before validating the index
+                and raise a ConnectionError if it is unreachable, at the cost of an extra
+                round-trip. Default to False.
         """
         self._es_client = es_client
         self._es_index = es_index
@@ -44,100 +162,211 @@ class ElasticsearchStore(BaseStore[str, List[float]], ElasticsearchIndexer):
         self._store_timestamp = store_timestamp
         self._namespace = namespace
         self._metadata = metadata
+        # the static part of every document is computed once here, so
+        # build_document only has to fill in the per-call fields; the
+        # metadata is deep-copied so later caller-side mutations cannot
+        # leak into every document written from the template
+        self._doc_base: Dict[str, Any] = {}
+        if metadata is not None:
+            self._doc_base["metadata"] = copy.deepcopy(metadata)
+        self._bulk_threads = bulk_threads
+        self._bulk_chunk_size = bulk_chunk_size
+        self._refresh_on_write = refresh_on_write
+        self._local_cache = LRUCache(local_cache_size) if local_cache_size else None
+        self._quantization = quantization
+        self._verify_on_init = verify_on_init
         self._logger = logging.getLogger(self.__class__.__name__)
+        self._warn_if_uncompressed()
         self._manage_index()
 
-    @cached_property
+    @property
     def mapping(self) -> Dict[str, Any]:
         """Get the default mapping for the index."""
-        return {
-            "mappings": {
-                "properties": {
-                    "llm_input": {"type": "text", "index": False},
-                    "vector_dump": {
-                        "type": "float",
-                        "index": False,
-                        "doc_values": False,
-                    },
-                    "metadata": {"type": "object"},
-                    "timestamp": {"type": "date"},
-                }
-            }
-        }
+        return _build_mapping(self._quantization)
 
     def _key(self, input_text: str) -> str:
         """Generate a key for the store."""
-        return hashlib.md5(((self._namespace or "") + input_text).encode()).hexdigest()
+        return _derive_key(self._namespace or "", input_text)
+
+    def _keys(self, input_texts: Sequence[str]) -> List[str]:
+        """Derive the store keys for a batch of inputs."""
+        namespace = self._namespace or ""
+        return [_derive_key(namespace, text) for text in input_texts]
 
     def mget(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
         """Get the values associated with the given keys."""
-        if not any(keys):
+        # an empty batch must not cost a round-trip
+        if not keys:
             return []
-        cache_keys = [self._key(k) for k in keys]
+        # duplicate keys within a batch are hashed, fetched and decoded once
+        unique_keys = list(dict.fromkeys(keys))
+        cache_keys = self._keys(unique_keys)
+        values: List[Optional[List[float]]] = [None] * len(cache_keys)
+        if self._local_cache is not None:
+            missing = []
+            for position, cache_key in enumerate(cache_keys):
+                local_hit = self._local_cache.get(cache_key)
+                if local_hit is not None:
+                    values[position] = local_hit
+                else:
+                    missing.append(position)
+            fetched = self._mfetch([cache_keys[position] for position in missing])
+            for position, vector in zip(missing, fetched):
+                values[position] = vector
+                if vector is not None:
+                    self._local_cache.set(cache_keys[position], vector)
+        else:
+            values = self._mfetch(cache_keys)
+        if len(unique_keys) == len(keys):
+            return values
+        by_key = dict(zip(unique_keys, values))
+        return [by_key[key] for key in keys]
+
+    def _mfetch(self, cache_keys: Sequence[str]) -> List[Optional[List[float]]]:
+        """Fetch and decode many vectors by key with a single request."""
+        if not cache_keys:
+            return []
+        values: List[Optional[List[float]]] = [None] * len(cache_keys)
         if self._is_alias:
+            # mget cannot address an alias spanning several indices, so the
+            # alias path stays on search; hits fill the pre-sized list directly
+            # filter_path strips the per-hit envelope down to the two
+            # fields the assembly loop reads, shrinking the response body
             results = self._es_client.search(
                 index=self._es_index,
                 body={
                     "query": {"ids": {"values": cache_keys}},
                     "size": len(cache_keys),
+                    "track_total_hits": False,
                 },
-                source_includes=["vector_dump"],
+                source_includes=["vector_dump", "vector_scale"],
+                filter_path=["hits.hits._id", "hits.hits._source"],
             )
-            map_ids = {
-                r["_id"]: r["_source"]["vector_dump"] for r in results["hits"]["hits"]
-            }
-            return [map_ids.get(k) for k in cache_keys]
+            positions = {cache_key: i for i, cache_key in enumerate(cache_keys)}
+            for record in results.get("hits", {}).get("hits", []):
+                values[positions[record["_id"]]] = _decode_source(record["_source"])
         else:
             records = self._es_client.mget(
-                index=self._es_index, ids=cache_keys, source_includes=["vector_dump"]
+                index=self._es_index,
+                ids=cache_keys,
+                source_includes=["vector_dump", "vector_scale"],
+                realtime=False,
+                filter_path=["docs.found", "docs._source"],
             )
-            return [
-                r["_source"]["vector_dump"] if r["found"] else None
-                for r in records["docs"]
-            ]
-
-    def build_document(self, llm_input: str, vector: List[float]) -> Dict[str, Any]:
-        """Build the Elasticsearch document for storing a single embedding"""
-        body: Dict[str, Any] = {"vector_dump": vector}
-        if self._metadata is not None:
-            body["metadata"] = self._metadata
+            for i, record in enumerate(records["docs"]):
+                if record.get("found"):
+                    values[i] = _decode_source(record["_source"])
+        return values
+
+    def build_document(
+        self, llm_input: str, vector: List[float], timestamp: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the Elasticsearch document for storing a single embedding.
+
+        An explicit `timestamp` lets batched writers stamp a whole batch
+        with a single datetime allocation. A numpy array is accepted in
+        place of the list and is narrowed or quantized without a Python
+        loop over the floats.
+        """
+        body = dict(self._doc_base)
+        if np is not None and isinstance(vector, np.ndarray):
+            # ndarray fast path: quantize or narrow in C, box floats once
+            if self._quantization == "int8":
+                scale = float(np.max(np.abs(vector))) / 127 or 1.0
+                body["vector_dump"] = np.rint(vector / scale).astype(np.int8).tolist()
+                body["vector_scale"] = scale
+            else:
+                body["vector_dump"] = np.ascontiguousarray(
+                    vector, dtype=np.float32
+                ).tolist()
+        elif self._quantization == "int8":
+            # symmetric per-vector quantization: one fp32 scale per document
+            scale = max(abs(value) for value in vector) / 127 or 1.0
+            body["vector_dump"] = [round(value / scale) for value in vector]
+            body["vector_scale"] = scale
+        else:
+            body["vector_dump"] = vector
         if self._store_input:
             body["llm_input"] = llm_input
         if self._store_timestamp:
-            body["timestamp"] = datetime.now().isoformat()
+            body["timestamp"] = timestamp or _now_iso()
         return body
 
+    _bulk_errors_kept = 5
+
     def _bulk(self, actions: Iterable[Dict[str, Any]]):
-        try:
-            helpers.bulk(
-                client=self._es_client,
-                actions=actions,
-                index=self._es_index,
-                require_alias=self._is_alias,
-                refresh=True,
-            )
-        except BulkIndexError as e:
-            first_error = e.errors[0].get("index", {}).get("error", {})
+        # stream the per-document results instead of letting the helper
+        # buffer every error dict, so a failing batch stays bounded in memory
+        failed = 0
+        errors: List[Any] = []
+        for ok, info in helpers.parallel_bulk(
+            client=self._es_client,
+            actions=actions,
+            thread_count=self._bulk_threads,
+            chunk_size=self._bulk_chunk_size,
+            max_chunk_bytes=10 * 1024 * 1024,
+            index=self._es_index,
+            require_alias=self._is_alias,
+            refresh=self._refresh_on_write,
+            raise_on_error=False,
+        ):
+            if not ok:
+                failed += 1
+                if len(errors) < self._bulk_errors_kept:
+                    errors.append(info)
+        if failed:
+            first_item: Dict[str, Any] = next(iter(errors[0].values()), {})
+            first_error = first_item.get("error", {})
             self._logger.error(f"First bulk error reason: {first_error.get('reason')}")
-            raise e
+            raise BulkIndexError(f"{failed} document(s) failed to index.", errors)
 
-    def mset(self, key_value_pairs: Sequence[Tuple[str, List[float]]]) -> None:
-        """Set the values for the given keys."""
-        actions = (
-            {
+    def flush(self) -> None:
+        """Make pending writes searchable with a single refresh, for use
+        with `refresh_on_write=False` once a batched ingestion is done."""
+        self._es_client.indices.refresh(index=self._es_index)
+
+    def _make_actions(
+        self,
+        cache_keys: Sequence[str],
+        key_value_pairs: Sequence[Tuple[str, List[float]]],
+    ) -> Iterator[Dict[str, Any]]:
+        """Generate the bulk index actions for a batch in a single pass.
+
+        A generator keeps peak memory at one bulk chunk of documents:
+        the bulk helpers stream it, overlapping encoding with the HTTP
+        requests. The whole batch shares one timestamp.
+        """
+        timestamp = _now_iso() if self._store_timestamp else None
+        build_document = self.build_document
+        for cache_key, (key, vector) in zip(cache_keys, key_value_pairs):
+            yield {
                 "_op_type": "index",
-                "_id": self._key(key),
-                "_source": self.build_document(key, vector),
+                "_id": cache_key,
+                "_source": build_document(key, vector, timestamp=timestamp),
             }
-            for key, vector in key_value_pairs
-        )
-        self._bulk(actions)
+
+    def mset(self, key_value_pairs: Sequence[Tuple[str, List[float]]]) -> None:
+        """Set the values for the given keys."""
+        # last write wins for duplicate keys, saving the earlier indexings
+        key_value_pairs = list(dict(key_value_pairs).items())
+        cache_keys = self._keys([key for key, _ in key_value_pairs])
+        self._bulk(self._make_actions(cache_keys, key_value_pairs))
+        if self._local_cache is not None:
+            for cache_key, (_, vector) in zip(cache_keys, key_value_pairs):
+                # cache plain lists only, so warm and cold reads agree
+                if np is not None and isinstance(vector, np.ndarray):
+                    vector = vector.tolist()
+                self._local_cache.set(cache_key, vector)
         return
 
     def mdelete(self, keys: Sequence[str]) -> None:
         """Delete the given keys and their associated values."""
-        actions = ({"_op_type": "delete", "_id": self._key(key)} for key in keys)
+        cache_keys = self._keys(list(dict.fromkeys(keys)))
+        actions = ({"_op_type": "delete", "_id": cache_key} for cache_key in cache_keys)
         self._bulk(actions)
+        if self._local_cache is not None:
+            for cache_key in cache_keys:
+                self._local_cache.delete(cache_key)
         return
 
     def yield_keys(self, *, prefix: Optional[str] = None) -> Iterator[str]:
@@ -145,3 +374,144 @@ class ElasticsearchStore(BaseStore[str, List[float]], ElasticsearchIndexer):
         # TODO This method is not currently used by CacheBackedEmbeddings, we can leave it blank.
         #      It could be implemented with ES "index_prefixes", but they are limited and expensive.
         raise NotImplementedError()
+
+
+class AsyncElasticsearchStore(AsyncElasticsearchIndexer, ElasticsearchStore):
+    """Store for embedding vectors using Elasticsearch, for asyncio-based
+    applications.
+
+    It takes an `AsyncElasticsearch` client and exposes the asynchronous
+    store interface (`amget`, `amset`, `amdelete`), so several independent
+    store operations can be awaited in parallel instead of blocking on one
+    network round-trip each. The index is verified lazily on the first
+    operation, since managing it requires awaits. The synchronous methods
+    are not available.
+    """
+
+    _es_client: elasticsearch.AsyncElasticsearch  # type: ignore[assignment]
+
+    def mget(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        raise NotImplementedError("Use amget with the asynchronous store.")
+
+    def mset(self, key_value_pairs: Sequence[Tuple[str, List[float]]]) -> None:
+        raise NotImplementedError("Use amset with the asynchronous store.")
+
+    def mdelete(self, keys: Sequence[str]) -> None:
+        raise NotImplementedError("Use amdelete with the asynchronous store.")
+
+    def flush(self) -> None:
+        raise NotImplementedError("Use aflush with the asynchronous store.")
+
+    async def amget(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        """Get the values associated with the given keys."""
+        # an empty batch must not cost a round-trip
+        if not keys:
+            return []
+        await self._async_manage_index()
+        unique_keys = list(dict.fromkeys(keys))
+        cache_keys = self._keys(unique_keys)
+        values: List[Optional[List[float]]] = [None] * len(cache_keys)
+        if self._local_cache is not None:
+            missing = []
+            for position, cache_key in enumerate(cache_keys):
+                local_hit = self._local_cache.get(cache_key)
+                if local_hit is not None:
+                    values[position] = local_hit
+                else:
+                    missing.append(position)
+            fetched = await self._amfetch(
+                [cache_keys[position] for position in missing]
+            )
+            for position, vector in zip(missing, fetched):
+                values[position] = vector
+                if vector is not None:
+                    self._local_cache.set(cache_keys[position], vector)
+        else:
+            values = await self._amfetch(cache_keys)
+        if len(unique_keys) == len(keys):
+            return values
+        by_key = dict(zip(unique_keys, values))
+        return [by_key[key] for key in keys]
+
+    async def _amfetch(self, cache_keys: Sequence[str]) -> List[Optional[List[float]]]:
+        """Fetch and decode many vectors by key with a single request."""
+        if not cache_keys:
+            return []
+        values: List[Optional[List[float]]] = [None] * len(cache_keys)
+        if self._is_alias:
+            results = await self._es_client.search(
+                index=self._es_index,
+                body={
+                    "query": {"ids": {"values": cache_keys}},
+                    "size": len(cache_keys),
+                    "track_total_hits": False,
+                },
+                source_includes=["vector_dump", "vector_scale"],
+                filter_path=["hits.hits._id", "hits.hits._source"],
+            )
+            positions = {cache_key: i for i, cache_key in enumerate(cache_keys)}
+            for record in results.get("hits", {}).get("hits", []):
+                values[positions[record["_id"]]] = _decode_source(record["_source"])
+        else:
+            records = await self._es_client.mget(
+                index=self._es_index,
+                ids=cache_keys,
+                source_includes=["vector_dump", "vector_scale"],
+                realtime=False,
+                filter_path=["docs.found", "docs._source"],
+            )
+            for i, record in enumerate(records["docs"]):
+                if record.get("found"):
+                    values[i] = _decode_source(record["_source"])
+        return values
+
+    async def _abulk(self, actions: Iterable[Dict[str, Any]]):
+        failed = 0
+        errors: List[Any] = []
+        async for ok, info in helpers.async_streaming_bulk(
+            client=self._es_client,
+            actions=actions,
+            chunk_size=self._bulk_chunk_size,
+            max_chunk_bytes=10 * 1024 * 1024,
+            index=self._es_index,
+            require_alias=self._is_alias,
+            refresh=self._refresh_on_write,
+            raise_on_error=False,
+        ):
+            if not ok:
+                failed += 1
+                if len(errors) < self._bulk_errors_kept:
+                    errors.append(info)
+        if failed:
+            first_item: Dict[str, Any] = next(iter(errors[0].values()), {})
+            first_error = first_item.get("error", {})
+            self._logger.error(f"First bulk error reason: {first_error.get('reason')}")
+            raise BulkIndexError(f"{failed} document(s) failed to index.", errors)
+
+    async def amset(self, key_value_pairs: Sequence[Tuple[str, List[float]]]) -> None:
+        """Set the values for the given keys."""
+        await self._async_manage_index()
+        key_value_pairs = list(dict(key_value_pairs).items())
+        cache_keys = self._keys([key for key, _ in key_value_pairs])
+        await self._abulk(self._make_actions(cache_keys, key_value_pairs))
+        if self._local_cache is not None:
+            for cache_key, (_, vector) in zip(cache_keys, key_value_pairs):
+                # cache plain lists only, so warm and cold reads agree
+                if np is not None and isinstance(vector, np.ndarray):
+                    vector = vector.tolist()
+                self._local_cache.set(cache_key, vector)
+
+    async def amdelete(self, keys: Sequence[str]) -> None:
+        """Delete the given keys and their associated values."""
+        await self._async_manage_index()
+        cache_keys = self._keys(list(dict.fromkeys(keys)))
+        actions = ({"_op_type": "delete", "_id": cache_key} for cache_key in cache_keys)
+        await self._abulk(actions)
+        if self._local_cache is not None:
+            for cache_key in cache_keys:
+                self._local_cache.delete(cache_key)
+
+    async def aflush(self) -> None:
+        """Make pending writes searchable with a single refresh, for use
+        with `refresh_on_write=False` once a batched ingestion is done."""
+        await self._es_client.indices.refresh(index=self._es_index)
@@ -1,18 +1,25 @@
 import pytest
-from unittest.mock import MagicMock
-from elasticsearch import Elasticsearch
+from unittest.mock import AsyncMock, MagicMock
+from elasticsearch import AsyncElasticsearch, Elasticsearch
 from elasticsearch._sync.client import IndicesClient
 from langchain_community.chat_models.fake import FakeMessagesListChatModel
 from langchain_core.messages import AIMessage
 
-from llmescache.langchain import ElasticsearchCache, ElasticsearchStore
+from llmescache.langchain import (
+    AsyncElasticsearchCache,
+    AsyncElasticsearchStore,
+    ElasticsearchCache,
+    ElasticsearchStore,
+)
 
 
 @pytest.fixture
 def es_client_fx():
     client_mock = MagicMock(spec=Elasticsearch)
     client_mock.indices = MagicMock(spec=IndicesClient)
-    yield client_mock()
+    client = client_mock()
+    client.indices.get.return_value = {"test_index": {"mappings": {}}}
+    yield client
 
 
 @pytest.fixture
@@ -27,6 +34,43 @@ def es_cache_fx(es_client_fx):
     )
 
 
+@pytest.fixture
+def es_async_client_fx():
+    client_mock = MagicMock(spec=AsyncElasticsearch)
+    for method in ("ping", "get", "mget", "create", "search", "delete_by_query"):
+        setattr(client_mock, method, AsyncMock())
+    client_mock.ping.return_value = True
+    client_mock.indices = MagicMock()
+    for method in ("get", "create", "put_mapping", "delete", "refresh"):
+        setattr(client_mock.indices, method, AsyncMock())
+    client_mock.indices.get.return_value = {"test_index": {"mappings": {}}}
+    yield client_mock
+
+
+@pytest.fixture
+def es_async_cache_fx(es_async_client_fx):
+    yield AsyncElasticsearchCache(
+        es_client=es_async_client_fx,
+        es_index="test_index",
+        store_input=True,
+        store_timestamp=True,
+        store_input_params=True,
+        metadata={"project": "test_project"},
+    )
+
+
+@pytest.fixture
+def es_async_store_fx(es_async_client_fx):
+    yield AsyncElasticsearchStore(
+        es_client=es_async_client_fx,
+        es_index="test_index",
+        store_input=True,
+        store_timestamp=True,
+        namespace="test",
+        metadata={"project": "test_project"},
+    )
+
+
 @pytest.fixture
 def es_store_fx(es_client_fx):
     yield ElasticsearchStore(
@@ -2,28 +2,75 @@ import pytest
 from elasticsearch import exceptions
 
 from llmescache.langchain import ElasticsearchCache, ElasticsearchStore
+from llmescache.langchain import base
 
 
 @pytest.mark.parametrize("implementation", [ElasticsearchCache, ElasticsearchStore])
 def test_initialization(es_client_fx, implementation):
+    # the cluster is pinged only on request
     es_client_fx.ping.return_value = False
     with pytest.raises(exceptions.ConnectionError):
-        implementation(es_client=es_client_fx, es_index="test_index")
-    es_client_fx.ping.return_value = True
-    es_client_fx.indices.exists_alias.return_value = True
+        implementation(
+            es_client=es_client_fx, es_index="test_index", verify_on_init=True
+        )
+    es_client_fx.indices.get.assert_not_called()
+    # an alias resolves to concrete indices under different names
+    es_client_fx.indices.get.return_value = {
+        "test_index-000002": {"aliases": {"test_index": {}}, "mappings": {}}
+    }
     cache = implementation(es_client=es_client_fx, es_index="test_index")
-    cache._es_client.indices.exists_alias.assert_called_with(name="test_index")
+    cache._es_client.indices.get.assert_called_once_with(
+        index="test_index", ignore_unavailable=True
+    )
     assert cache._is_alias
     cache._es_client.indices.put_mapping.assert_called_with(
         index="test_index", body=cache.mapping["mappings"]
     )
-    es_client_fx.indices.exists_alias.return_value = False
-    es_client_fx.indices.exists.return_value = False
+    # a second instance on the same client and index skips the validation
+    implementation(es_client=es_client_fx, es_index="test_index")
+    es_client_fx.indices.get.assert_called_once()
+    base._validated_indices.pop(es_client_fx, None)
+    es_client_fx.indices.get.return_value = {}
     cache = implementation(es_client=es_client_fx, es_index="test_index")
     assert not cache._is_alias
     cache._es_client.indices.create.assert_called_with(
         index="test_index", body=cache.mapping
     )
+    # an index whose mapping is already in place needs no write at all
+    base._validated_indices.pop(es_client_fx, None)
+    es_client_fx.indices.get.return_value = {
+        "test_index": {"mappings": cache.mapping["mappings"]}
+    }
+    cache = implementation(es_client=es_client_fx, es_index="test_index")
+    assert not cache._is_alias
+    cache._es_client.indices.put_mapping.assert_called_once()
+
+
+def test_lazy_init(es_client_fx):
+    cache = ElasticsearchCache(
+        es_client=es_client_fx, es_index="test_index", lazy_init=True
+    )
+    es_client_fx.indices.get.assert_not_called()
+    cache._es_client.get.return_value = {"_source": {"llm_output": "[]"}}
+    assert cache.lookup("test_prompt", "test_llm_string") == []
+    # the first operation validated the index
+    es_client_fx.indices.get.assert_called_once()
+    assert base._validated_indices[es_client_fx] == {"test_index": False}
+    cache.lookup("test_prompt", "test_llm_string")
+    es_client_fx.indices.get.assert_called_once()
+
+
+def test_make_es_client():
+    pytest.importorskip("orjson")
+    from llmescache.langchain import make_es_client
+
+    client = make_es_client("http://localhost:9200")
+    serializer = client.transport.serializers.get_serializer("application/json")
+    # transport compression and the fast serializer are wired in by default
+    assert type(serializer).__name__ == "OrjsonSerializer"
+    # float payloads survive the round trip exactly
+    vector = [1.5, 2.0, 3.6, 1e-7]
+    assert serializer.loads(serializer.dumps(vector)) == vector
 
 
 @pytest.mark.parametrize("indexer", ["es_cache_fx", "es_store_fx"])
@@ -31,3 +78,31 @@ def test_mapping(indexer, request):
     mapping = request.getfixturevalue(indexer).mapping
     assert mapping.get("mappings")
     assert mapping["mappings"].get("properties")
+
+
+def test_shared_client():
+    from llmescache.langchain import shared_client
+
+    client = shared_client("http://localhost:9200")
+    # the same arguments hand back the same client and connection pool
+    assert shared_client("http://localhost:9200") is client
+    assert shared_client("http://localhost:9200").transport is client.transport
+    assert shared_client("http://localhost:9201") is not client
+    # a hosts list is hashable-ized rather than rejected
+    client = shared_client(hosts=["http://localhost:9200"])
+    assert shared_client(hosts=["http://localhost:9200"]) is client
+
+
+def test_compression_warning(es_client_fx, caplog):
+    import logging
+
+    from llmescache.langchain import ElasticsearchCache
+
+    # a client without an inspectable transport is fine, silently
+    with caplog.at_level(logging.WARNING):
+        ElasticsearchCache(es_client=es_client_fx, es_index="test_index")
+    assert not caplog.records
+    es_client_fx.transport.node_pool.get.return_value.config.http_compress = False
+    with caplog.at_level(logging.WARNING):
+        ElasticsearchCache(es_client=es_client_fx, es_index="test_index")
+    assert any("http_compress" in record.message for record in caplog.records)
@@ -0,0 +1,79 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from elastic_transport import ApiResponseMeta, HttpHeaders, NodeConfig
+from elasticsearch import NotFoundError
+from langchain_core.load import dumps
+from langchain_core.outputs import Generation
+
+
+def test_sync_methods_raise(es_async_cache_fx):
+    with pytest.raises(NotImplementedError):
+        es_async_cache_fx.lookup("test_prompt", "test_llm_string")
+    with pytest.raises(NotImplementedError):
+        es_async_cache_fx.update("test_prompt", "test_llm_string", [])
+    with pytest.raises(NotImplementedError):
+        es_async_cache_fx.clear()
+    with pytest.raises(NotImplementedError):
+        es_async_cache_fx.mlookup([("test_prompt", "test_llm_string")])
+    with pytest.raises(NotImplementedError):
+        es_async_cache_fx.lookup_many([("test_prompt", "test_llm_string")])
+    with pytest.raises(NotImplementedError):
+        es_async_cache_fx.bulk_update([("test_prompt", "test_llm_string", [])])
+    with pytest.raises(NotImplementedError):
+        es_async_cache_fx.evict_older_than(timedelta(days=1))
+
+
+def test_alookup(es_async_cache_fx):
+    cache_key = es_async_cache_fx._key("test_prompt", "test_llm_string")
+    client = es_async_cache_fx._es_client
+    client.get.side_effect = NotFoundError(
+        "not found",
+        ApiResponseMeta(404, "0", HttpHeaders(), 0, NodeConfig("http", "xxx", 80)),
+        "",
+    )
+
+    async def run():
+        assert await es_async_cache_fx.alookup("test_prompt", "test_llm_string") is None
+        # the index is verified lazily, once
+        client.indices.get.assert_awaited_once()
+        client.get.assert_awaited_once_with(
+            index="test_index",
+            id=cache_key,
+            source=["llm_output"],
+            routing=cache_key,
+            realtime=False,
+        )
+        client.get.side_effect = None
+        client.get.return_value = {
+            "_source": {"llm_output": [dumps(Generation(text="test"))]}
+        }
+        assert await es_async_cache_fx.alookup("test_prompt", "test_llm_string") == [
+            Generation(text="test")
+        ]
+        client.indices.get.assert_awaited_once()
+
+    asyncio.run(run())
+
+
+def test_aupdate_and_aclear(es_async_cache_fx):
+    client = es_async_cache_fx._es_client
+
+    async def run():
+        await es_async_cache_fx.aupdate(
+            "test_prompt", "test_llm_string", [Generation(text="test")]
+        )
+        client.create.assert_awaited_once()
+        assert client.create.call_args.kwargs["id"] == es_async_cache_fx._key(
+            "test_prompt", "test_llm_string"
+        )
+        await es_async_cache_fx.aclear()
+        client.indices.delete.assert_awaited_once_with(
+            index="test_index", ignore_unavailable=True
+        )
+        client.indices.create.assert_awaited_once_with(
+            index="test_index", body=es_async_cache_fx.mapping
+        )
+
+    asyncio.run(run())
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+
+def test_sync_methods_raise(es_async_store_fx):
+    with pytest.raises(NotImplementedError):
+        es_async_store_fx.mget(["test_text"])
+    with pytest.raises(NotImplementedError):
+        es_async_store_fx.mset([("test_text", [1.5])])
+    with pytest.raises(NotImplementedError):
+        es_async_store_fx.mdelete(["test_text"])
+    with pytest.raises(NotImplementedError):
+        es_async_store_fx.flush()
+
+
+def test_amget(es_async_store_fx):
+    client = es_async_store_fx._es_client
+    cache_keys = es_async_store_fx._keys(["test_text1", "test_text2"])
+    client.mget.return_value = {
+        "docs": [
+            {"_id": cache_keys[0], "found": False},
+            {
+                "_id": cache_keys[1],
+                "found": True,
+                "_source": {"vector_dump": [1.5, 2, 3.6]},
+            },
+        ]
+    }
+
+    async def run():
+        assert await es_async_store_fx.amget([]) == []
+        client.mget.assert_not_awaited()
+        assert await es_async_store_fx.amget(["test_text1", "test_text2"]) == [
+            None,
+            [1.5, 2, 3.6],
+        ]
+        # the index is verified lazily, once
+        client.indices.get.assert_awaited_once()
+        client.mget.assert_awaited_once_with(
+            index="test_index",
+            ids=cache_keys,
+            source_includes=["vector_dump", "vector_scale"],
+            realtime=False,
+            filter_path=["docs.found", "docs._source"],
+        )
+
+    asyncio.run(run())
+
+
+def test_amset_and_amdelete(es_async_store_fx):
+    from unittest.mock import patch
+
+    async def run():
+        with patch("elasticsearch.helpers.async_streaming_bulk") as bulk_mock:
+
+            async def results(*args, **kwargs):
+                yield True, {}
+
+            bulk_mock.side_effect = lambda *args, **kwargs: results()
+            await es_async_store_fx.amset([("test_text1", [1.5, 2])])
+            actions = list(bulk_mock.call_args.kwargs["actions"])
+            assert actions[0]["_id"] == es_async_store_fx._key("test_text1")
+            await es_async_store_fx.amdelete(["test_text1"])
+            actions = list(bulk_mock.call_args.kwargs["actions"])
+            assert actions == [
+                {"_op_type": "delete", "_id": es_async_store_fx._key("test_text1")}
+            ]
+        await es_async_store_fx.aflush()
+        es_async_store_fx._es_client.indices.refresh.assert_awaited_once_with(
+            index="test_index"
+        )
+
+    asyncio.run(run())
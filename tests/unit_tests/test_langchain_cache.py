@@ -1,7 +1,9 @@
 from datetime import datetime
+from typing import Dict, Any
+from unittest.mock import patch, ANY
 
 from elastic_transport import ApiResponseMeta, HttpHeaders, NodeConfig
-from elasticsearch import NotFoundError
+from elasticsearch import ConflictError, NotFoundError
 from langchain_core.load import dumps
 from langchain_core.outputs import Generation
 
@@ -13,9 +15,17 @@ def test_key_generation(es_cache_fx):
     assert key2 and key1 != key2
     key3 = es_cache_fx._key("test_prompt1", "test_llm_string")
     assert key3 and key1 != key3
+    assert es_cache_fx._keys(
+        [
+            ("test_prompt", "test_llm_string"),
+            ("test_prompt", "test_llm_string1"),
+            ("test_prompt1", "test_llm_string"),
+        ]
+    ) == [key1, key2, key3]
 
 
 def test_clear(es_cache_fx):
+    es_cache_fx._is_alias = True
     es_cache_fx.clear()
     es_cache_fx._es_client.delete_by_query.assert_called_once_with(
         index="test_index",
@@ -23,6 +33,14 @@ def test_clear(es_cache_fx):
         refresh=True,
         wait_for_completion=True,
     )
+    es_cache_fx._is_alias = False
+    es_cache_fx.clear()
+    es_cache_fx._es_client.indices.delete.assert_called_once_with(
+        index="test_index", ignore_unavailable=True
+    )
+    es_cache_fx._es_client.indices.create.assert_called_once_with(
+        index="test_index", body=es_cache_fx.mapping
+    )
 
 
 def test_build_document(es_cache_fx):
@@ -31,26 +49,227 @@ def test_build_document(es_cache_fx):
     )
     assert doc["llm_input"] == "test_prompt"
     assert doc["llm_params"] == "test_llm_string"
-    assert isinstance(doc["llm_output"], list)
-    assert all(isinstance(gen, str) for gen in doc["llm_output"])
+    assert isinstance(doc["llm_output"], str)
     assert datetime.fromisoformat(str(doc["timestamp"]))
     assert doc["metadata"] == es_cache_fx._metadata
 
 
 def test_update(es_cache_fx):
     es_cache_fx.update("test_prompt", "test_llm_string", [Generation(text="test")])
-    timestamp = es_cache_fx._es_client.index.call_args.kwargs["body"]["timestamp"]
+    timestamp = es_cache_fx._es_client.create.call_args.kwargs["body"]["timestamp"]
     doc = es_cache_fx.build_document(
         "test_prompt", "test_llm_string", [Generation(text="test")]
     )
     doc["timestamp"] = timestamp
-    es_cache_fx._es_client.index.assert_called_once_with(
+    es_cache_fx._es_client.create.assert_called_once_with(
         index=es_cache_fx._es_index,
         id=es_cache_fx._key("test_prompt", "test_llm_string"),
         body=doc,
+        routing=es_cache_fx._key("test_prompt", "test_llm_string"),
         require_alias=es_cache_fx._is_alias,
         refresh=True,
     )
+    # an existing entry is left untouched instead of being rewritten
+    es_cache_fx._es_client.create.side_effect = ConflictError(
+        "conflict",
+        ApiResponseMeta(409, "0", HttpHeaders(), 0, NodeConfig("http", "xxx", 80)),
+        "",
+    )
+    es_cache_fx.update("test_prompt", "test_llm_string", [Generation(text="test")])
+
+
+def test_refresh_on_write(es_client_fx):
+    from llmescache.langchain import ElasticsearchCache
+
+    cache = ElasticsearchCache(
+        es_client=es_client_fx, es_index="test_index", refresh_on_write=False
+    )
+    cache._is_alias = False
+    cache.update("test_prompt", "test_llm_string", [Generation(text="test")])
+    assert cache._es_client.create.call_args.kwargs["refresh"] is False
+    cache.flush()
+    cache._es_client.indices.refresh.assert_called_once_with(index="test_index")
+
+
+def test_mlookup(es_cache_fx):
+    pairs = [
+        ("test_prompt1", "test_llm_string"),
+        ("test_prompt2", "test_llm_string"),
+        ("test_prompt3", "test_llm_string"),
+    ]
+    cache_keys = es_cache_fx._keys(pairs)
+    docs = {
+        "docs": [
+            {"_index": "test_index", "_id": cache_keys[0], "found": False},
+            {
+                "_index": "test_index",
+                "_id": cache_keys[1],
+                "found": True,
+                "_source": {"llm_output": [dumps(Generation(text="test2"))]},
+            },
+            {
+                "_index": "test_index",
+                "_id": cache_keys[2],
+                "found": True,
+                "_source": {"llm_output": [dumps(Generation(text="test3"))]},
+            },
+        ]
+    }
+    es_cache_fx._is_alias = False
+    es_cache_fx._es_client.mget.return_value = docs
+    assert es_cache_fx.mlookup([]) == []
+    assert es_cache_fx.mlookup(pairs) == [
+        None,
+        [Generation(text="test2")],
+        [Generation(text="test3")],
+    ]
+    es_cache_fx._es_client.mget.assert_called_once_with(
+        index="test_index",
+        ids=cache_keys,
+        source_includes=["llm_output"],
+        realtime=False,
+    )
+    es_cache_fx._is_alias = True
+    es_cache_fx._es_client.search.return_value = {
+        "hits": {"total": {"value": 0}, "hits": []}
+    }
+    assert es_cache_fx.mlookup(pairs) == [None, None, None]
+    es_cache_fx._es_client.search.assert_called_once_with(
+        index="test_index",
+        body={
+            "query": {"terms": {"_id": cache_keys}},
+            "size": 3,
+            "track_total_hits": False,
+        },
+        source_includes=["llm_output"],
+        routing=",".join(cache_keys),
+    )
+    es_cache_fx._es_client.search.return_value = {
+        "hits": {
+            "total": {"value": 3},
+            "hits": [
+                {
+                    "_index": "index_1",
+                    "_id": cache_keys[1],
+                    "_source": {"llm_output": [dumps(Generation(text="old"))]},
+                },
+                {
+                    "_index": "index_2",
+                    "_id": cache_keys[1],
+                    "_source": {"llm_output": [dumps(Generation(text="new"))]},
+                },
+                {
+                    "_index": "index_1",
+                    "_id": cache_keys[2],
+                    "_source": {"llm_output": [dumps(Generation(text="test3"))]},
+                },
+            ],
+        }
+    }
+    assert es_cache_fx.mlookup(pairs) == [
+        None,
+        [Generation(text="new")],
+        [Generation(text="test3")],
+    ]
+    # lookup_many is the public alias of the batched path
+    assert es_cache_fx.lookup_many(pairs) == es_cache_fx.mlookup(pairs)
+
+
+def test_local_cache(es_client_fx):
+    from llmescache.langchain import ElasticsearchCache
+
+    cache = ElasticsearchCache(
+        es_client=es_client_fx, es_index="test_index", local_cache_size=10
+    )
+    cache._is_alias = False
+    cache._es_client.get.return_value = {
+        "_source": {"llm_output": [dumps(Generation(text="test"))]}
+    }
+    assert cache.lookup("test_prompt", "test_llm_string") == [Generation(text="test")]
+    assert cache.lookup("test_prompt", "test_llm_string") == [Generation(text="test")]
+    # the second lookup is served by the in-process cache
+    cache._es_client.get.assert_called_once()
+    cache.clear()
+    cache.lookup("test_prompt", "test_llm_string")
+    assert cache._es_client.get.call_count == 2
+    # update populates the local cache as well
+    cache.update("test_prompt2", "test_llm_string", [Generation(text="test2")])
+    assert cache.lookup("test_prompt2", "test_llm_string") == [Generation(text="test2")]
+    assert cache._es_client.get.call_count == 2
+    # mlookup mixes local hits and fetched misses
+    cache._es_client.mget.return_value = {
+        "docs": [
+            {
+                "_id": cache._key("test_prompt3", "test_llm_string"),
+                "found": True,
+                "_source": {"llm_output": [dumps(Generation(text="test3"))]},
+            }
+        ]
+    }
+    assert cache.mlookup(
+        [("test_prompt2", "test_llm_string"), ("test_prompt3", "test_llm_string")]
+    ) == [[Generation(text="test2")], [Generation(text="test3")]]
+    cache._es_client.mget.assert_called_once_with(
+        index="test_index",
+        ids=[cache._key("test_prompt3", "test_llm_string")],
+        source_includes=["llm_output"],
+        realtime=False,
+    )
+
+
+def test_serialization_roundtrip():
+    from langchain_core.messages import AIMessage
+    from langchain_core.outputs import ChatGeneration
+
+    from llmescache.langchain.cache import _dumps_generations, _loads_generations
+
+    generations = [
+        Generation(text="test"),
+        ChatGeneration(message=AIMessage(content="test output")),
+    ]
+    blob = _dumps_generations(generations)
+    assert isinstance(blob, str)
+    assert _loads_generations(blob) == generations
+    # documents written by older versions hold a list of serialized strings
+    assert _loads_generations([dumps(gen) for gen in generations]) == generations
+
+
+def _del_timestamp(doc: Dict[str, Any]) -> Dict[str, Any]:
+    doc["_source"].pop("timestamp", None)
+    return doc
+
+
+def test_bulk_update(es_cache_fx):
+    items = [
+        ("test_prompt1", "test_llm_string", [Generation(text="test1")]),
+        ("test_prompt2", "test_llm_string", [Generation(text="test2")]),
+    ]
+    actions = [
+        {
+            "_op_type": "index",
+            "_id": es_cache_fx._key(prompt, llm_string),
+            "_routing": es_cache_fx._key(prompt, llm_string),
+            "_source": es_cache_fx.build_document(prompt, llm_string, return_val),
+        }
+        for prompt, llm_string, return_val in items
+    ]
+    es_cache_fx._is_alias = False
+    with patch("elasticsearch.helpers.parallel_bulk") as bulk_mock:
+        bulk_mock.return_value = iter([])
+        es_cache_fx.bulk_update(items)
+        bulk_mock.assert_called_once_with(
+            client=es_cache_fx._es_client,
+            actions=ANY,
+            thread_count=8,
+            chunk_size=500,
+            queue_size=4,
+            index="test_index",
+            require_alias=False,
+            refresh=True,
+        )
+        assert [_del_timestamp(d) for d in bulk_mock.call_args.kwargs["actions"]] == [
+            _del_timestamp(d) for d in actions
+        ]
 
 
 def test_lookup(es_cache_fx):
@@ -64,7 +283,11 @@ def test_lookup(es_cache_fx):
     )
     assert es_cache_fx.lookup("test_prompt", "test_llm_string") is None
     es_cache_fx._es_client.get.assert_called_once_with(
-        index="test_index", id=cache_key, source=["llm_output"]
+        index="test_index",
+        id=cache_key,
+        source=["llm_output"],
+        routing=cache_key,
+        realtime=False,
     )
     es_cache_fx._es_client.get.side_effect = None
     es_cache_fx._es_client.get.return_value = doc
@@ -78,17 +301,61 @@ def test_lookup(es_cache_fx):
     assert es_cache_fx.lookup("test_prompt", "test_llm_string") is None
     es_cache_fx._es_client.search.assert_called_once_with(
         index="test_index",
-        body={"query": {"term": {"_id": cache_key}}},
+        body={
+            "query": {"term": {"_id": cache_key}},
+            "sort": [{"_index": {"order": "desc"}}],
+            "size": 1,
+            "terminate_after": 1,
+            "track_total_hits": False,
+        },
         source_includes=["llm_output"],
+        routing=cache_key,
     )
-    doc["_index"] = "index_1"
+    # the latest index wins, and the sorting happens on the ES side
     doc2 = {
         "_index": "index_2",
         "_source": {"llm_output": [dumps(Generation(text="test2"))]},
     }
     es_cache_fx._es_client.search.return_value = {
-        "hits": {"total": {"value": 2}, "hits": [doc, doc2]}
+        "hits": {"total": {"value": 2}, "hits": [doc2]}
     }
     assert es_cache_fx.lookup("test_prompt", "test_llm_string") == [
         Generation(text="test2")
     ]
+
+
+def test_evict_older_than(es_cache_fx):
+    from datetime import timedelta
+
+    client = es_cache_fx._es_client
+    client.open_point_in_time.return_value = {"id": "pit-1"}
+    hits = [
+        {"_index": "test_index-000001", "_id": "key1", "sort": [1]},
+        {"_index": "test_index-000001", "_id": "key2", "sort": [2]},
+    ]
+    client.search.side_effect = [
+        {"pit_id": "pit-2", "hits": {"hits": hits}},
+        {"pit_id": "pit-2", "hits": {"hits": []}},
+    ]
+    with patch("elasticsearch.helpers.parallel_bulk") as bulk_mock:
+        bulk_mock.return_value = iter([])
+        assert es_cache_fx.evict_older_than(timedelta(days=7)) == 2
+        # deletes target each hit's concrete index directly
+        assert bulk_mock.call_args.kwargs["require_alias"] is False
+        assert list(bulk_mock.call_args.kwargs["actions"]) == [
+            {"_op_type": "delete", "_id": "key1", "_index": "test_index-000001"},
+            {"_op_type": "delete", "_id": "key2", "_index": "test_index-000001"},
+        ]
+    client.open_point_in_time.assert_called_once_with(
+        index="test_index", keep_alive="5m"
+    )
+    first_body = client.search.call_args_list[0].kwargs["body"]
+    assert first_body["query"] == {"range": {"timestamp": {"lt": ANY}}}
+    assert datetime.fromisoformat(first_body["query"]["range"]["timestamp"]["lt"])
+    assert first_body["pit"] == {"id": "pit-1", "keep_alive": "5m"}
+    assert "search_after" not in first_body
+    # the next page resumes after the last hit, on the refreshed pit id
+    second_body = client.search.call_args_list[1].kwargs["body"]
+    assert second_body["search_after"] == [2]
+    assert second_body["pit"]["id"] == "pit-2"
+    client.close_point_in_time.assert_called_once_with(id="pit-2")
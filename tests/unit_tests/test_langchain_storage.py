@@ -1,7 +1,12 @@
 from datetime import datetime
+from types import GeneratorType
 from typing import Dict, Any
 from unittest.mock import patch, ANY
 
+import pytest
+
+from llmescache.langchain.storage import _decode_source, _load_vector, _vec_struct
+
 
 def test_key_generation(es_store_fx):
     key1 = es_store_fx._key("test_text")
@@ -14,6 +19,10 @@ def test_key_generation(es_store_fx):
     es_store_fx._namespace = None
     key4 = es_store_fx._key("test_text")
     assert key4 and key1 != key4 and key3 != key4
+    assert es_store_fx._keys(["test_text", "test_text2"]) == [
+        key4,
+        es_store_fx._key("test_text2"),
+    ]
 
 
 def test_build_document(es_store_fx):
@@ -24,6 +33,16 @@ def test_build_document(es_store_fx):
     assert doc["metadata"] == es_store_fx._metadata
 
 
+def test_vector_codec():
+    import base64
+
+    vector = [0.0, -1.25, 3.5, 1e-3]
+    # documents written by intermediate versions hold a base64 fp32 blob
+    legacy = base64.b64encode(_vec_struct(len(vector)).pack(*vector)).decode()
+    assert _load_vector(legacy) == pytest.approx(vector, rel=1e-6)
+    assert _load_vector(vector) == vector
+
+
 def test_mget(es_store_fx):
     cache_keys = [
         es_store_fx._key("test_text1"),
@@ -50,19 +69,26 @@ def test_mget(es_store_fx):
     es_store_fx._is_alias = False
     es_store_fx._es_client.mget.return_value = docs
     assert es_store_fx.mget([]) == []
+    # an empty batch issues no request at all
+    es_store_fx._es_client.mget.assert_not_called()
     assert es_store_fx.mget(["test_text1", "test_text2", "test_text3"]) == [
         None,
         [1.5, 2, 3.6],
         [5, 6, 7.1],
     ]
     es_store_fx._es_client.mget.assert_called_with(
-        index="test_index", ids=cache_keys, source_includes=["vector_dump"]
+        index="test_index",
+        ids=cache_keys,
+        source_includes=["vector_dump", "vector_scale"],
+        realtime=False,
+        filter_path=["docs.found", "docs._source"],
     )
     es_store_fx._is_alias = True
     es_store_fx._es_client.search.return_value = {
         "hits": {"total": {"value": 0}, "hits": []}
     }
     assert es_store_fx.mget([]) == []
+    es_store_fx._es_client.search.assert_not_called()
     assert es_store_fx.mget(["test_text1", "test_text2", "test_text3"]) == [
         None,
         None,
@@ -73,8 +99,10 @@ def test_mget(es_store_fx):
         body={
             "query": {"ids": {"values": cache_keys}},
             "size": 3,
+            "track_total_hits": False,
         },
-        source_includes=["vector_dump"],
+        source_includes=["vector_dump", "vector_scale"],
+        filter_path=["hits.hits._id", "hits.hits._source"],
     )
     resp = {
         "hits": {"total": {"value": 3}, "hits": [d for d in docs["docs"] if d["found"]]}
@@ -93,45 +121,201 @@ def _del_timestamp(doc: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def test_mset(es_store_fx):
-    input = [("test_text1", [1.5, 2, 3.6]), ("test_text2", [5, 6, 7.1])]
+    items = [("test_text1", [1.5, 2, 3.6]), ("test_text2", [5, 6, 7.1])]
     actions = [
         {
             "_op_type": "index",
             "_id": es_store_fx._key(k),
             "_source": es_store_fx.build_document(k, v),
         }
-        for k, v in input
+        for k, v in items
     ]
     es_store_fx._is_alias = False
-    with patch("elasticsearch.helpers.bulk") as bulk_mock:
+    with patch("elasticsearch.helpers.parallel_bulk") as bulk_mock:
+        bulk_mock.return_value = iter([])
         es_store_fx.mset([])
         bulk_mock.assert_called_once()
-        es_store_fx.mset(input)
+        bulk_mock.return_value = iter([])
+        es_store_fx.mset(items)
         bulk_mock.assert_called_with(
             client=es_store_fx._es_client,
             actions=ANY,
+            thread_count=4,
+            chunk_size=500,
+            max_chunk_bytes=10 * 1024 * 1024,
             index="test_index",
             require_alias=False,
             refresh=True,
+            raise_on_error=False,
         )
-        assert [_del_timestamp(d) for d in bulk_mock.call_args.kwargs["actions"]] == [
+        # documents are streamed, not materialized up front
+        assert isinstance(bulk_mock.call_args.kwargs["actions"], GeneratorType)
+        written = list(bulk_mock.call_args.kwargs["actions"])
+        # the whole batch shares a single timestamp
+        assert len({d["_source"]["timestamp"] for d in written}) == 1
+        assert [_del_timestamp(d) for d in written] == [
             _del_timestamp(d) for d in actions
         ]
 
 
 def test_mdelete(es_store_fx):
-    input = ["test_text1", "test_text2"]
-    actions = [{"_op_type": "delete", "_id": es_store_fx._key(k)} for k in input]
+    keys = ["test_text1", "test_text2"]
+    actions = [{"_op_type": "delete", "_id": es_store_fx._key(k)} for k in keys]
     es_store_fx._is_alias = False
-    with patch("elasticsearch.helpers.bulk") as bulk_mock:
+    with patch("elasticsearch.helpers.parallel_bulk") as bulk_mock:
+        bulk_mock.return_value = iter([])
         es_store_fx.mdelete([])
         bulk_mock.assert_called_once()
-        es_store_fx.mdelete(input)
+        bulk_mock.return_value = iter([])
+        es_store_fx.mdelete(keys)
         bulk_mock.assert_called_with(
             client=es_store_fx._es_client,
             actions=ANY,
+            thread_count=4,
+            chunk_size=500,
+            max_chunk_bytes=10 * 1024 * 1024,
             index="test_index",
             require_alias=False,
             refresh=True,
+            raise_on_error=False,
         )
         assert list(bulk_mock.call_args.kwargs["actions"]) == actions
+
+
+def test_batch_deduplication(es_store_fx):
+    es_store_fx._is_alias = False
+    cache_key = es_store_fx._key("test_text1")
+    es_store_fx._es_client.mget.return_value = {
+        "docs": [
+            {"_id": cache_key, "found": True, "_source": {"vector_dump": [1.5, 2]}}
+        ]
+    }
+    assert es_store_fx.mget(["test_text1", "test_text1"]) == [[1.5, 2], [1.5, 2]]
+    # the duplicate key is sent to ES only once
+    assert es_store_fx._es_client.mget.call_args.kwargs["ids"] == [cache_key]
+    with patch("elasticsearch.helpers.parallel_bulk", return_value=iter([])) as bulk:
+        es_store_fx.mset([("test_text1", [1.5, 2]), ("test_text1", [5, 6])])
+        actions = list(bulk.call_args.kwargs["actions"])
+    # last write wins for duplicate keys within a batch
+    assert len(actions) == 1
+    assert actions[0]["_source"]["vector_dump"] == [5, 6]
+
+
+def test_quantization(es_client_fx):
+    from llmescache.langchain import ElasticsearchStore
+
+    store = ElasticsearchStore(
+        es_client=es_client_fx, es_index="test_index", quantization="int8"
+    )
+    mapping = store.mapping["mappings"]["properties"]
+    assert mapping["vector_dump"]["element_type"] == "byte"
+    doc = store.build_document("test_text", [1.5, -2, 3.6])
+    assert all(isinstance(v, int) and -127 <= v <= 127 for v in doc["vector_dump"])
+    restored = _decode_source(doc)
+    assert restored == pytest.approx([1.5, -2, 3.6], abs=3.6 / 127)
+    # the all-zeros vector does not divide by a zero scale
+    doc = store.build_document("test_text", [0.0, 0.0])
+    assert _decode_source(doc) == [0.0, 0.0]
+    # mget dequantizes transparently
+    store._is_alias = False
+    doc = store.build_document("test_text", [1.5, -2, 3.6])
+    store._es_client.mget.return_value = {
+        "docs": [
+            {
+                "_id": store._key("test_text"),
+                "found": True,
+                "_source": {
+                    "vector_dump": doc["vector_dump"],
+                    "vector_scale": doc["vector_scale"],
+                },
+            }
+        ]
+    }
+    assert store.mget(["test_text"])[0] == pytest.approx([1.5, -2, 3.6], abs=3.6 / 127)
+
+
+def test_local_cache(es_client_fx):
+    from llmescache.langchain import ElasticsearchStore
+
+    store = ElasticsearchStore(
+        es_client=es_client_fx,
+        es_index="test_index",
+        namespace="test",
+        local_cache_size=10,
+    )
+    store._is_alias = False
+    store._es_client.mget.return_value = {
+        "docs": [
+            {
+                "_id": store._key("test_text1"),
+                "found": True,
+                "_source": {"vector_dump": [1.5, 2, 3.6]},
+            }
+        ]
+    }
+    assert store.mget(["test_text1"]) == [[1.5, 2, 3.6]]
+    assert store.mget(["test_text1"]) == [[1.5, 2, 3.6]]
+    # the second get is served by the in-process cache
+    store._es_client.mget.assert_called_once()
+    # mset populates the local cache, mdelete evicts
+    with patch("elasticsearch.helpers.parallel_bulk", return_value=iter([])):
+        store.mset([("test_text2", [5, 6, 7.1])])
+        assert store.mget(["test_text2"]) == [[5, 6, 7.1]]
+        store._es_client.mget.assert_called_once()
+    with patch("elasticsearch.helpers.parallel_bulk", return_value=iter([])):
+        store.mdelete(["test_text2"])
+    store._es_client.mget.return_value = {
+        "docs": [{"_id": store._key("test_text2"), "found": False}]
+    }
+    assert store.mget(["test_text2"]) == [None]
+    assert store._es_client.mget.call_count == 2
+
+
+def test_bulk_error_handling(es_store_fx):
+    from elasticsearch.helpers import BulkIndexError
+
+    results = iter(
+        [(True, {})] + [(False, {"index": {"error": {"reason": "boom"}}})] * 10
+    )
+    with patch("elasticsearch.helpers.parallel_bulk", return_value=results):
+        with pytest.raises(BulkIndexError) as exc:
+            es_store_fx.mset([("test_text1", [1.5, 2])])
+    # only a bounded sample of the failures is kept
+    assert len(exc.value.errors) == es_store_fx._bulk_errors_kept
+
+
+def test_flush(es_store_fx):
+    es_store_fx.flush()
+    es_store_fx._es_client.indices.refresh.assert_called_once_with(index="test_index")
+
+
+def test_numpy_vectors(es_client_fx, es_store_fx):
+    np = pytest.importorskip("numpy")
+    from llmescache.langchain import ElasticsearchStore
+
+    vector = np.array([1.5, 2, 3.6], dtype=np.float64)
+    doc = es_store_fx.build_document("test_text", vector)
+    # the array is narrowed to float32 and boxed once, at the JSON boundary
+    assert doc["vector_dump"] == np.asarray(vector, dtype=np.float32).tolist()
+    assert all(isinstance(value, float) for value in doc["vector_dump"])
+    store = ElasticsearchStore(
+        es_client=es_client_fx, es_index="test_index", quantization="int8"
+    )
+    doc = store.build_document("test_text", vector)
+    assert (
+        doc["vector_dump"]
+        == store.build_document("test_text", vector.tolist())["vector_dump"]
+    )
+    assert doc["vector_scale"] == pytest.approx(3.6 / 127)
+    # a zero vector must not divide by a zero scale
+    assert store.build_document("test_text", np.zeros(3))["vector_dump"] == [0, 0, 0]
+    # a warm read returns a plain list, like a cold one
+    store = ElasticsearchStore(
+        es_client=es_client_fx, es_index="test_index", local_cache_size=10
+    )
+    store._is_alias = False
+    with patch("elasticsearch.helpers.parallel_bulk") as bulk_mock:
+        bulk_mock.return_value = iter([])
+        store.mset([("test_text", vector)])
+    assert store.mget(["test_text"]) == [vector.tolist()]
+    store._es_client.mget.assert_not_called()